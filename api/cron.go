@@ -1,6 +1,7 @@
 package handler
 
 import (
+	"bufio"
 	"encoding/json"
 	"fmt"
 	"io/ioutil"
@@ -90,7 +91,7 @@ func loadConfig() (*Config, error) {
 		if err := json.Unmarshal([]byte(appsEnv), &apps); err != nil {
 			return nil, fmt.Errorf("failed to parse STREAMLIT_APPS env var: %w", err)
 		}
-		return &Config{Apps: apps}, nil
+		return &Config{Apps: dedupeURLs(normalizeURLs(apps))}, nil
 	}
 
 	// Fallback to hardcoded config (not recommended for production)
@@ -102,6 +103,58 @@ func loadConfig() (*Config, error) {
 	}, nil
 }
 
+// normalizeURLs defaults app URLs without a scheme to https://
+func normalizeURLs(apps []string) []string {
+	normalized := make([]string, 0, len(apps))
+	var fixed []string
+	for _, app := range apps {
+		if !strings.HasPrefix(app, "http://") && !strings.HasPrefix(app, "https://") {
+			fixed = append(fixed, app)
+			app = "https://" + app
+		}
+		normalized = append(normalized, app)
+	}
+
+	if len(fixed) > 0 {
+		fmt.Printf("Warning: added https:// to URLs without a scheme: %s\n", strings.Join(fixed, ", "))
+	}
+	return normalized
+}
+
+// dedupeURLs drops repeated app URLs, keeping the first occurrence, so each app gets one result
+func dedupeURLs(apps []string) []string {
+	seen := make(map[string]bool, len(apps))
+	unique := make([]string, 0, len(apps))
+	for _, app := range apps {
+		if seen[app] {
+			fmt.Printf("Warning: skipping duplicate app URL: %s\n", app)
+			continue
+		}
+		seen[app] = true
+		unique = append(unique, app)
+	}
+	return unique
+}
+
+// cdpEndpoint returns the WebSocket endpoint of a shared Chromium, if one is configured
+func cdpEndpoint() string {
+	if endpoint := os.Getenv("CDP_ENDPOINT"); endpoint != "" {
+		return endpoint
+	}
+
+	// A long-lived Chromium sidecar may write its endpoint to a file instead
+	if path := os.Getenv("CDP_ENDPOINT_FILE"); path != "" {
+		data, err := ioutil.ReadFile(path)
+		if err != nil {
+			fmt.Printf("Warning: failed to read CDP endpoint file %s: %v\n", path, err)
+			return ""
+		}
+		return strings.TrimSpace(string(data))
+	}
+
+	return ""
+}
+
 func runWakeScript(apps []string) ([]map[string]interface{}, error) {
 	results := make([]map[string]interface{}, 0, len(apps))
 
@@ -109,77 +162,279 @@ func runWakeScript(apps []string) ([]map[string]interface{}, error) {
 	script := `#!/usr/bin/env python3
 import sys
 import subprocess
-import time
+import argparse
+import asyncio
 import json
+import re
 
 # Install playwright if not available
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 except ImportError:
     print("Installing playwright...")
     subprocess.check_call([sys.executable, "-m", "pip", "install", "playwright"])
     subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+MAX_CONCURRENCY = 5
+TIMEOUT = 30000
+CLICK_TIMEOUT = 2000
+APP_FRAME_TIMEOUT = 5000
+WAKE_TIMEOUT = 15000
+
+# Trim Chromium's helper processes and background work so it fits in less memory
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--no-zygote',
+    '--disable-features=TranslateUI,BlinkGenPropertyTrees',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--blink-settings=imagesEnabled=false'
+]
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Selectors are built once at import time and shared by every URL
+WAKE_BUTTON_TEXTS = (
+    "Yes, get this app back up!",
+    "Wake up",
+    "Start app",
+    "Rerun"
+)
+WAKE_BUTTON_PATTERN = "|".join(re.escape(text) for text in WAKE_BUTTON_TEXTS)
+WAKE_SELECTORS = tuple(f"button:has-text('{text}')" for text in WAKE_BUTTON_TEXTS)
+RUNNING_SELECTORS = (
+    "[data-testid='stApp']",
+    ".stApp",
+    "[data-testid='stSidebar']",
+    ".main .block-container"
+)
+WAKE_SELECTOR = ",".join(WAKE_SELECTORS)
+RUNNING_SELECTOR = ",".join(RUNNING_SELECTORS)
+
+# Wake-up detection only needs the DOM, so skip heavy and third-party resources
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics.com", "doubleclick.net", "segment.io")
+
+# On Community Cloud a running app renders inside this iframe, not the top document
+APP_FRAME_SELECTOR = "iframe[title='streamlitApp']"
+
+# A wake-up button, the rendered Streamlit app or its app frame means the page is ready
+READY_SELECTOR = WAKE_SELECTOR + "," + RUNNING_SELECTOR + "," + APP_FRAME_SELECTOR
+
+# Locator waits resolve .first in DOM order, so skip hidden matches before picking one
+VISIBLE_ONLY = " >> visible=true"
+
+# Classify the page in one round-trip: a wake-up button, a running app, or neither.
+# The matched button is marked so the click targets exactly the element that was detected
+WAKE_TARGET_ATTR = "data-wake-target"
+DETECT_STATE_JS = """([wakePattern, runningSelector, targetAttr]) => {
+    const wakeRe = new RegExp(wakePattern, 'i');
+    const visible = b => b.checkVisibility ? b.checkVisibility() : b.offsetParent !== null;
+    const wake = [...document.querySelectorAll('button')].find(b => visible(b) && wakeRe.test(b.textContent));
+    if (wake) {
+        wake.setAttribute(targetAttr, '');
+        return {kind: 'wake', label: wake.textContent.trim()};
+    }
+    if (document.querySelector(runningSelector)) return {kind: 'running'};
+    return {kind: 'none'};
+}"""
+
+def import_httpx():
+    # httpx is only needed for the opt-in HTTP check, so install it on demand
+    try:
+        import httpx
+    except ImportError:
+        print("Installing httpx...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "httpx"])
+        import httpx
+    return httpx
+
+async def is_awake(client, url):
+    # Fast path: an awake app serves the Streamlit shell without the wake-up prompt.
+    # The prompt is rendered client-side, so the raw HTML may not show it; any
+    # failure (including a malformed URL) falls through to the browser check
+    try:
+        r = await client.get(url)
+    except Exception:
+        return False
+    return r.status_code == 200 and 'back up' not in r.text and 'stApp' in r.text
+
+async def wait_until_running(page, timeout):
+    # The app may render in the top document or in the app frame; whichever shows up first wins
+    running = RUNNING_SELECTOR + VISIBLE_ONLY
+    waits = [
+        asyncio.ensure_future(page.locator(running).first.wait_for(state='visible', timeout=timeout)),
+        asyncio.ensure_future(
+            page.frame_locator(APP_FRAME_SELECTOR).locator(running).first.wait_for(state='visible', timeout=timeout)
+        )
+    ]
+    try:
+        for done in asyncio.as_completed(waits):
+            try:
+                await done
+                return True
+            except PlaywrightTimeoutError:
+                pass
+        return False
+    finally:
+        for wait in waits:
+            wait.cancel()
 
-def wake_app(url):
+async def wake_app(page_pool, client, url, warm):
     result = {"url": url, "status": "unknown", "message": ""}
     
+    if client is not None and await is_awake(client, url):
+        result["status"] = "already_awake"
+        result["message"] = "HTTP check: app is serving, no wake-up needed"
+        return result
+    
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
-            page = browser.new_page()
-            
+        page = await page_pool.get()
+        
+        try:
+            await page.goto(url, timeout=TIMEOUT, wait_until='domcontentloaded')
+            # The sleep page is rendered by client-side JS, so readiness keeps the full navigation budget
+            ready = True
             try:
-                page.goto(url, timeout=30000, wait_until='networkidle')
-                time.sleep(3)
-                
-                # Look for wake-up buttons
-                buttons = [
-                    "Yes, get this app back up!",
-                    "Wake up",
-                    "Start app",
-                    "Rerun"
-                ]
-                
-                button_clicked = False
-                for btn_text in buttons:
-                    try:
-                        button = page.locator(f"button:has-text('{btn_text}')")
-                        if button.is_visible():
-                            button.click()
-                            result["status"] = "woken_up"
-                            result["message"] = f"Clicked: {btn_text}"
-                            button_clicked = True
-                            time.sleep(5)
-                            break
-                    except:
-                        continue
-                
-                if not button_clicked:
-                    result["status"] = "already_awake"
-                    result["message"] = "No wake-up button found, app appears awake"
-                    
-            except Exception as e:
-                result["status"] = "error"
-                result["message"] = str(e)
-            finally:
-                browser.close()
+                await page.locator(READY_SELECTOR + VISIBLE_ONLY).first.wait_for(state='visible', timeout=TIMEOUT)
+            except PlaywrightTimeoutError:
+                ready = False
+            
+            # Later navigations hit a warm cache; only the first ones get a short safety wait
+            if not warm.is_set():
+                await asyncio.sleep(0.5)
+                warm.set()
+            
+            state = await page.evaluate(DETECT_STATE_JS, [WAKE_BUTTON_PATTERN, RUNNING_SELECTOR, WAKE_TARGET_ATTR])
+            if state["kind"] == "wake":
+                await page.locator(f"[{WAKE_TARGET_ATTR}]").first.click(timeout=CLICK_TIMEOUT)
+                result["status"] = "woken_up"
+                result["message"] = f"Clicked: {state['label']}"
+                if not await wait_until_running(page, WAKE_TIMEOUT):
+                    result["message"] += " (clicked; readiness check timed out)"
+            elif state["kind"] == "running":
+                result["status"] = "already_awake"
+                result["message"] = "Streamlit app is running"
+            elif not ready:
+                result["status"] = "unknown"
+                result["message"] = "Page did not render a wake-up button or the app before timing out"
+            elif await wait_until_running(page, APP_FRAME_TIMEOUT):
+                result["status"] = "already_awake"
+                result["message"] = "Streamlit app is running"
+            else:
+                result["status"] = "unknown"
+                result["message"] = "App frame loaded but the app did not render in time"
                 
+        except Exception as e:
+            result["status"] = "error"
+            result["message"] = str(e)
+        finally:
+            # Reset the page and hand it back to the pool for the next URL
+            try:
+                await page.goto('about:blank')
+            except Exception:
+                pass
+            page_pool.put_nowait(page)
+            
     except Exception as e:
         result["status"] = "error"
         result["message"] = f"Browser error: {str(e)}"
     
-    print(json.dumps(result))
     return result
 
+async def block_resources(route, request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def wake_apps(urls, max_concurrency=MAX_CONCURRENCY, cdp_endpoint=None, low_memory=False,
+                    http_check=False):
+    async with async_playwright() as p:
+        if cdp_endpoint:
+            # Reuse a long-lived Chromium instead of cold-starting one per run
+            browser = await p.chromium.connect_over_cdp(cdp_endpoint)
+        else:
+            # --single-process saves the most memory but is less stable, so it is opt-in
+            launch_args = BROWSER_ARGS + (['--single-process'] if low_memory else [])
+            browser = await p.chromium.launch(
+                headless=True,
+                chromium_sandbox=False,
+                args=launch_args
+            )
+        context = await browser.new_context(
+            ignore_https_errors=True,
+            java_script_enabled=True,
+            viewport={'width': 1280, 'height': 800}
+        )
+        await context.route("**/*", block_resources)
+        
+        # One shared context; the page pool also bounds concurrency, and with a
+        # single worker the same page is reused for every URL
+        warm = asyncio.Event()
+        page_pool = asyncio.Queue()
+        client = None
+        try:
+            for _ in range(max(1, min(max_concurrency, len(urls)))):
+                page_pool.put_nowait(await context.new_page())
+            
+            # The HTTP fast path is unverified against sleeping apps, so it is opt-in
+            if http_check:
+                httpx = import_httpx()
+                client = httpx.AsyncClient(
+                    timeout=10,
+                    follow_redirects=True,
+                    headers={'User-Agent': USER_AGENT}
+                )
+            
+            # Yield each result as soon as its app finishes
+            for task in asyncio.as_completed([wake_app(page_pool, client, url, warm) for url in urls]):
+                yield await task
+        finally:
+            if client is not None:
+                await client.aclose()
+            while not page_pool.empty():
+                await page_pool.get_nowait().close()
+            await context.close()
+            if not cdp_endpoint:
+                await browser.close()
+
+async def main(args):
+    # The Go handler tallies and logs the summary from these JSON lines
+    reported = set()
+    
+    def report(result):
+        print(json.dumps(result), flush=True)
+        reported.add(result["url"])
+    
+    try:
+        async for result in wake_apps(args.urls, max_concurrency=args.max_concurrency,
+                                      cdp_endpoint=args.cdp_endpoint, low_memory=args.low_memory,
+                                      http_check=args.http_check):
+            report(result)
+    except Exception as e:
+        for url in args.urls:
+            if url not in reported:
+                report({"url": url, "status": "error", "message": f"Browser error: {str(e)}"})
+
 if __name__ == '__main__':
-    urls = sys.argv[1:]
-    for url in urls:
-        wake_app(url)
-        time.sleep(2)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('urls', nargs='*')
+    parser.add_argument('--max-concurrency', type=int, default=MAX_CONCURRENCY,
+                        help='Number of apps to wake at once; 1 wakes them sequentially on one page')
+    parser.add_argument('--cdp-endpoint', help='Connect to a running Chromium over CDP instead of launching one')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Run Chromium in single-process mode to reduce memory use')
+    parser.add_argument('--http-check', action='store_true',
+                        help='Skip the browser for apps whose plain HTTP response looks awake')
+    args = parser.parse_args()
+    asyncio.run(main(args))
 `
 
 	// Write script to temporary file
@@ -189,40 +444,76 @@ if __name__ == '__main__':
 		return results, fmt.Errorf("failed to create script: %w", err)
 	}
 
-	// Execute Python script for each app
-	for _, app := range apps {
-		result := map[string]interface{}{
-			"url":     app,
-			"status":  "unknown",
-			"message": "",
+	// Execute Python script once for all apps; it wakes them concurrently
+	args := []string{scriptPath}
+	if endpoint := cdpEndpoint(); endpoint != "" {
+		args = append(args, "--cdp-endpoint", endpoint)
+	}
+	if maxConcurrency := os.Getenv("MAX_CONCURRENCY"); maxConcurrency != "" {
+		args = append(args, "--max-concurrency", maxConcurrency)
+	}
+	if os.Getenv("LOW_MEMORY") == "true" {
+		args = append(args, "--low-memory")
+	}
+	if os.Getenv("HTTP_CHECK") == "true" {
+		args = append(args, "--http-check")
+	}
+	args = append(args, apps...)
+	cmd := exec.Command("python3", args...)
+	cmd.Stderr = os.Stderr
+	stdout, execErr := cmd.StdoutPipe()
+	if execErr == nil {
+		execErr = cmd.Start()
+	}
+
+	// Log each JSON result as soon as the Python script prints it, keyed by URL
+	pythonResults := make(map[string]map[string]interface{}, len(apps))
+	if execErr == nil {
+		scanner := bufio.NewScanner(stdout)
+		scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
+		for scanner.Scan() {
+			var pythonResult map[string]interface{}
+			if json.Unmarshal(scanner.Bytes(), &pythonResult) != nil {
+				continue
+			}
+			if url, ok := pythonResult["url"].(string); ok {
+				pythonResults[url] = pythonResult
+				fmt.Printf("App: %s | Status: %s | Message: %s\n",
+					url, pythonResult["status"], pythonResult["message"])
+			}
 		}
+		execErr = cmd.Wait()
+	}
 
-		cmd := exec.Command("python3", scriptPath, app)
-		output, err := cmd.CombinedOutput()
+	// Fill in apps the script never reported and write their log with the summary at once
+	var logBuilder strings.Builder
+	statusCounts := make(map[string]int)
 
-		if err != nil {
-			result["status"] = "error"
-			result["message"] = fmt.Sprintf("Execution error: %v", err)
-		} else {
-			// Try to parse JSON output from Python script
-			outputStr := strings.TrimSpace(string(output))
-			lines := strings.Split(outputStr, "\n")
-
-			for _, line := range lines {
-				var pythonResult map[string]interface{}
-				if json.Unmarshal([]byte(line), &pythonResult) == nil {
-					if pythonResult["url"] == app {
-						result = pythonResult
-						break
-					}
-				}
+	for _, app := range apps {
+		result, ok := pythonResults[app]
+		if !ok {
+			result = map[string]interface{}{
+				"url":     app,
+				"status":  "unknown",
+				"message": "",
 			}
+			if execErr != nil {
+				result["status"] = "error"
+				result["message"] = fmt.Sprintf("Execution error: %v", execErr)
+			}
+			fmt.Fprintf(&logBuilder, "App: %s | Status: %s | Message: %s\n",
+				result["url"], result["status"], result["message"])
 		}
 
 		results = append(results, result)
-		fmt.Printf("App: %s | Status: %s | Message: %s\n",
-			result["url"], result["status"], result["message"])
+		statusCounts[fmt.Sprint(result["status"])]++
 	}
 
+	// Anything that is not woken up, awake or an error counts as unknown so the totals add up
+	unknown := len(apps) - statusCounts["woken_up"] - statusCounts["already_awake"] - statusCounts["error"]
+	fmt.Fprintf(&logBuilder, "Summary: %d woken up, %d already awake, %d errors, %d unknown\n",
+		statusCounts["woken_up"], statusCounts["already_awake"], statusCounts["error"], unknown)
+	os.Stdout.WriteString(logBuilder.String())
+
 	return results, nil
 }